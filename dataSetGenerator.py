@@ -4,13 +4,13 @@ Generates training data using A* search algorithm on warehouse grid
 """
 
 import random 
-import sqlite3
 import csv
-import db_func
-conn, cursor = db_func.db_connect()
+import os
+import functools
+from multiprocessing import Pool
 
 from setGrid import generate_warehouse, get_warehouse_grid
-from search import a_star_search
+from search import a_star_cost, bfs_search, build_shelf_aisle_map, manhattan, pack_grid
 
 #data needed: start_x, start_y, goal_x, goal_y, path_length, path_exists
 '''
@@ -27,22 +27,28 @@ Grid_Width = 63
 Grid_Height = 13    
 Train_samples =  500
 Test_samples =  100
+Bfs_threshold = 9               #manhattan distance below which plain BFS is used
+Pool_threshold = 2000           #sample count from which the samples are generated in a process pool
+CSV_header = ['start_x', 'start_y', 'goal_x', 'goal_y', 'path_length', 'path_exists']
 
-def generate_sample(grid, aisles, shelves):
+def generate_sample(grid, start, goal, shelf_map=None):
     """
     Generates a single data sample using A* search on the warehouse grid.
     
-    :param grid: List of Lists representing the grid
-    :param aisles: List of tuples representing aisle coordinates
-    :param shelves: List of tuples representing shelf coordinates
+    :param grid: Packed grid from pack_grid
+    :param start: Tuple (x, y) of the start aisle coordinate
+    :param goal: Tuple (x, y) of the goal shelf coordinate
+    :param shelf_map: Optional shelf to aisle table from build_shelf_aisle_map
     """
-    start = (random.choice(aisles))
-    goal = (random.choice(shelves))
-    
-    path, cost, expansions, run_time = a_star_search(grid, start, goal)
+    #short routes are cheaper without a heap
+    if manhattan(start, goal) < Bfs_threshold:
+        path, cost, expansions, run_time = bfs_search(grid, start, goal, shelf_map)
+    else:
+        #only the cost is stored, so the mid-range search skips building the path
+        cost, expansions = a_star_cost(grid, start, goal, shelf_map)
 
-    #If no path exists 
-    if path is None:
+    #If no path exists (every search reports an infinite cost)
+    if cost == float("inf"):
         return [
             start[0], start[1],
             goal[0], goal[1],
@@ -58,6 +64,42 @@ def generate_sample(grid, aisles, shelves):
         1       #path exists (true)
     ]
 
+@functools.lru_cache(maxsize=None)
+def load_layout():
+    """
+    Loads shelf and aisle coordinates from the database and builds the packed grid
+    and its shelf to aisle table. Cached, so the training and test sets share one query.
+    
+    Returns (grid, shelf_map, shelves, aisles)
+    """
+    shelf_coords, aisle_coords = get_warehouse_grid()
+    grid = pack_grid(generate_warehouse(Grid_Width, Grid_Height, shelf_coords))
+    return grid, build_shelf_aisle_map(grid), tuple(shelf_coords), tuple(aisle_coords)
+
+#Worker state, set once per process by _worker_init so the grid is not pickled per sample
+_worker_grid = None
+_worker_shelf_map = None
+
+def _worker_init(grid, shelf_map):
+    """
+    Pool initializer: stores the warehouse grid and shelf table as module globals in each worker.
+
+    :param grid: Packed grid from pack_grid
+    :param shelf_map: Shelf to aisle table from build_shelf_aisle_map
+    """
+    global _worker_grid, _worker_shelf_map
+    _worker_grid = grid
+    _worker_shelf_map = shelf_map
+
+def _run_sample(pair):
+    """
+    Runs a single sample inside a pool worker.
+
+    :param pair: Tuple (start, goal) of coordinates
+    """
+    start, goal = pair
+    return generate_sample(_worker_grid, start, goal, _worker_shelf_map)
+
 def generate_dataset(filename, num_samples):
     """
     Generates a dataset of samples and saves it to a CSV file.
@@ -65,21 +107,24 @@ def generate_dataset(filename, num_samples):
     :param filename: Name of the CSV file to save the dataset
     :param num_samples: Number of samples to generate
     """
-    shelf_coords, path_coords = get_warehouse_grid()
-    grid = generate_warehouse(Grid_Width, Grid_Height, shelf_coords)
-
-    data = []
+    grid, shelf_map, shelf_coords, aisle_coords = load_layout()
 
-    s, a = get_warehouse_grid()
+    #draw every start/goal pair up front
+    starts = random.choices(aisle_coords, k=num_samples)
+    goals = random.choices(shelf_coords, k=num_samples)
 
-    for _ in range(num_samples):
-            sample = generate_sample(grid, a, s)
-            data.append(sample)
+    #A* runs are independent, so large datasets are spread across all cores
+    #smaller ones take less time than starting the pool (about 70 us per sample), so they run here
+    if num_samples >= Pool_threshold:
+        with Pool(processes=os.cpu_count(), initializer=_worker_init, initargs=(grid, shelf_map)) as pool:
+            data = list(pool.imap_unordered(_run_sample, zip(starts, goals), chunksize=32))
+    else:
+        data = [generate_sample(grid, start, goal, shelf_map) for start, goal in zip(starts, goals)]
 
     #save to csv
     with open(filename,'w', newline='') as file:
         writer = csv.writer(file)
-        writer.writerow(['start_x', 'start_y', 'goal_x', 'goal_y', 'path_length', 'path_exists'])
+        writer.writerow(CSV_header)
         writer.writerows(data)
 
     print(f"Dataset '{filename}' with {num_samples} samples generated.")
@@ -9,18 +9,24 @@ import torch
 #Import neural network layers and components
 import torch.nn as nn
 
+#Import functional forms of layers and losses (no module objects needed)
+import torch.nn.functional as F
+
 #Import optimization algorithms for training
 import torch.optim as optim
 
 #Import numerical computing library
 import numpy as np
 
-#Import deque for efficient memory storage
-from collections import deque
-
 #Import random number generation
 import random
 
+#Import math for the scalar distance in step()
+import math
+
+#Import warnings to silence TorchScript's deprecation notice
+import warnings
+
 #==================== NEURAL NETWORK ====================
 
 class DQNNetwork(nn.Module):
@@ -86,6 +92,33 @@ class DQNNetwork(nn.Module):
 
 #==================== ENVIRONMENT ====================
 
+#Offsets of the 8 surrounding cells, in state order
+SURROUND_OFFSETS = [(-1,-1), (-1,0), (-1,1), (0,-1), (0,1), (1,-1), (1,0), (1,1)]
+
+def build_surround_table(walkable_mask):
+    """
+    Precompute the 8 surrounding-cell values of every grid cell
+    
+    Each value is 1.0 for a 0 (walkable) cell or out of bounds and 0.0 otherwise,
+    matching the encoding the trained models use.
+    
+    Args:
+        walkable_mask: Boolean array [rows, cols], True where the grid is 0
+    
+    Returns:
+        float32 numpy array with shape [rows, cols, 8]
+    """
+    rows, cols = walkable_mask.shape
+    
+    #A one cell border of 1.0 makes out of bounds read as an obstacle without bounds checks
+    surround_pad = np.pad(walkable_mask.astype(np.float32), 1, constant_values=1.0)
+    
+    #Filled one neighbour offset at a time by slicing the padded grid, so per step it is a single lookup
+    table = np.empty((rows, cols, 8), dtype=np.float32)
+    for k, (dr, dc) in enumerate(SURROUND_OFFSETS):
+        table[:, :, k] = surround_pad[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+    return table
+
 class GridEnvironment:
     """
     2D Grid navigation environment
@@ -99,7 +132,7 @@ class GridEnvironment:
     - State representation
     """
     
-    def __init__(self, grid, start, target_item):
+    def __init__(self, grid, start, target_item, device=None):
         """
         Initialize the environment
         
@@ -107,6 +140,7 @@ class GridEnvironment:
             grid: 2D list where 0=walkable, 1=wall, other=item
             start: Tuple (row, col) for agent start position
             target_item: The number of the item to find
+            device: Device to build state tensors on (default CPU), e.g. the agent's cuda device
         """
         #Convert grid to numpy array for efficient operations
         self.grid = np.array(grid)
@@ -115,21 +149,51 @@ class GridEnvironment:
         self.start = start
         
         #Current position of the agent (changes as agent moves)
-        #np.array makes it a numpy array for vector operations
-        self.agent_pos = np.array(start)
+        #Positions are plain (row, col) tuples of ints: each step only touches 2 numbers,
+        #so numpy arrays would add dispatch and allocation cost without any benefit
+        self.agent_pos = (int(start[0]), int(start[1]))
         
         #The item number we're trying to find
         self.target_item = target_item
         
         #Only call _find_target() if target_item is in the grid
         try:
-            self.goal_pos = self._find_target()
+            goal = self._find_target()
+            self.goal_pos = (int(goal[0]), int(goal[1]))
         except ValueError:
-            self.goal_pos = np.array(start)  #Fallback to start position
+            self.goal_pos = self.agent_pos  #Fallback to start position
         
         #Store grid dimensions (rows, cols)
         self.grid_size = self.grid.shape
         
+        #Boolean masks of the grid, computed once (1 byte per cell) instead of comparing every step
+        #_wall_mask: cells the agent cannot enter (value 1)
+        #_walkable_mask: empty cells (value 0)
+        self._wall_mask = self.grid == 1
+        self._walkable_mask = self.grid == 0
+        
+        #Table of the 8 neighbour values for every cell, shape [rows, cols, 8], see build_surround_table
+        rows, cols = self.grid_size
+        self._surround_table = build_surround_table(self._walkable_mask)
+        
+        #Reusable state buffer, filled in place by _get_state every step
+        #The tensor view shares memory with the numpy array, shape [1, 12]
+        self._state_np = np.empty(12, dtype=np.float32)
+        self._state_tensor = torch.from_numpy(self._state_np).unsqueeze(0)
+        
+        #Device the states are returned on
+        #On a GPU the state is assembled there directly, so act() never copies it host-to-device
+        self.device = torch.device(device) if device is not None else torch.device("cpu")
+        self._on_device = self.device.type != "cpu"
+        if self._on_device:
+            #Per-cell [row, col, 8 surrounding values] table kept on the device, shape [rows, cols, 10]
+            coords = np.indices((rows, cols)).transpose(1, 2, 0).astype(np.float32)
+            self._cell_table_t = torch.from_numpy(np.concatenate([coords, self._surround_table], axis=2)).to(self.device)
+            
+            #Goal position on the device, refreshed by _get_state when the goal changes
+            self._goal_t = None
+            self._goal_t_pos = None
+        
         #Define the four possible actions as coordinate changes
         #0=up: (-1, 0) means row decreases (move up)
         #1=down: (1, 0) means row increases (move down)
@@ -153,8 +217,32 @@ class GridEnvironment:
             new_target_pos: Tuple (row, col) for new target position
         """
         self.start = new_start
-        self.agent_pos = np.array(new_start)
-        self.goal_pos = np.array(new_target_pos)
+        self.agent_pos = (int(new_start[0]), int(new_start[1]))
+        self.goal_pos = (int(new_target_pos[0]), int(new_target_pos[1]))
+        self.step_count = 0
+    
+    def reconfigure(self, new_start, target_item):
+        """
+        Point the environment at a new start and target item on the same grid
+        
+        Keeps the grid, its precomputed tables and the state buffers, so one
+        environment can serve many queries without rebuilding them.
+        
+        Args:
+            new_start: Tuple (row, col) for new starting position
+            target_item: The number of the item to find
+        """
+        self.start = new_start
+        self.agent_pos = (int(new_start[0]), int(new_start[1]))
+        self.target_item = target_item
+        
+        #Same goal lookup and fallback as __init__
+        try:
+            goal = self._find_target()
+            self.goal_pos = (int(goal[0]), int(goal[1]))
+        except ValueError:
+            self.goal_pos = self.agent_pos
+        
         self.step_count = 0
     
     def _find_target(self):
@@ -167,17 +255,16 @@ class GridEnvironment:
         Raises:
             ValueError if target not found in grid
         """
-        #Loop through each row
-        for i in range(self.grid.shape[0]):
-            #Loop through each column
-            for j in range(self.grid.shape[1]):
-                #Check if this cell contains the target item
-                if self.grid[i][j] == self.target_item:
-                    #Return the position as numpy array
-                    return np.array([i, j])
-        
-        #If we get here, target wasn't found - raise error
-        raise ValueError(f"Target item {self.target_item} not found in grid")
+        #Compare every cell with the target in one vectorized pass
+        #argwhere returns the [row, col] of each match in row-major order
+        hits = np.argwhere(self.grid == self.target_item)
+
+        #No matches - target wasn't found, raise error
+        if hits.size == 0:
+            raise ValueError(f"Target item {self.target_item} not found in grid")
+
+        #Return the first match, same as scanning row by row
+        return hits[0]
     
     def reset(self):
         """
@@ -187,7 +274,7 @@ class GridEnvironment:
             Initial state after reset
         """
         #Move agent back to starting position
-        self.agent_pos = np.array(self.start)
+        self.agent_pos = (int(self.start[0]), int(self.start[1]))
         
         #Reset step counter
         self.step_count = 0
@@ -204,24 +291,71 @@ class GridEnvironment:
         Returns:
             PyTorch tensor with shape [1, 12] representing current state
         """
-        #Combine multiple features into one state vector
-        state = np.concatenate([
-            #Agent's current position (2 values)
-            self.agent_pos.astype(float),
-            
-            #Goal's position (2 values)
-            self.goal_pos.astype(float),
-            
-            #Information about 8 surrounding cells (8 values)
-            self._get_surrounding()
-        ])
+        #GPU: build the state from device-side tables
+        if self._on_device:
+            return self._get_state_on_device()
+        
+        #Fill the preallocated buffer in place instead of concatenating new arrays
+        buf = self._state_np
+        
+        #Agent's current position (2 values)
+        buf[0:2] = self.agent_pos
+        
+        #Goal's position (2 values)
+        buf[2:4] = self.goal_pos
+        
+        #Information about 8 surrounding cells (8 values), written straight into the buffer
+        self._get_surrounding(out=buf[4:12])
         
-        #Convert numpy array to PyTorch tensor
-        #dtype=torch.float32 specifies 32-bit floating point precision
-        #unsqueeze(0) adds batch dimension: [12] -> [1, 12]
-        return torch.tensor(state, dtype=torch.float32).unsqueeze(0)
+        #Return a copy of the [1, 12] tensor view
+        #The buffer is overwritten next step, while callers keep state and next_state side by side
+        return self._state_tensor.clone()
     
-    def _get_surrounding(self):
+    def _get_state_on_device(self):
+        """
+        Create the current state directly on self.device
+        Same 12 values as _get_state, gathered from the device-side cell table
+        
+        Returns:
+            PyTorch tensor with shape [1, 12] on self.device
+        """
+        #Goal only changes between episodes, so it is copied to the device only when it does
+        if self._goal_t_pos != self.goal_pos:
+            self._goal_t = torch.tensor(self.goal_pos, dtype=torch.float32, device=self.device)
+            self._goal_t_pos = self.goal_pos
+        
+        #[row, col, 8 surrounding values] of the agent's cell, indexed with Python ints (no sync)
+        cell = self._cell_table_t[self.agent_pos[0], self.agent_pos[1]]
+        
+        #[agent_row, agent_col, goal_row, goal_col, 8 surrounding cells] -> [1, 12]
+        return torch.cat((cell[:2], self._goal_t, cell[2:])).unsqueeze(0)
+    
+    def fill_state_into(self, buf):
+        """
+        Write the current state into a caller-provided tensor
+        Same 12 values as _get_state, without allocating a new tensor
+        
+        Args:
+            buf: float32 tensor with shape [1, 12], on any device
+        
+        Returns:
+            buf
+        """
+        #GPU: concatenate the device-side values straight into the buffer (one kernel, no copy)
+        if self._on_device and buf.device == self.device:
+            self._get_state_on_device()    #refreshes the cached goal tensor if needed
+            cell = self._cell_table_t[self.agent_pos[0], self.agent_pos[1]]
+            torch.cat((cell[:2], self._goal_t, cell[2:]), out=buf[0])
+            return buf
+        
+        #CPU: fill the reusable numpy buffer, then one copy into the caller's tensor
+        self._state_np[0:2] = self.agent_pos
+        self._state_np[2:4] = self.goal_pos
+        self._get_surrounding(out=self._state_np[4:12])
+        buf.copy_(self._state_tensor)
+        return buf
+    
+    def _get_surrounding(self, out=None):
         """
         Get information about the 8 cells surrounding the agent
         
@@ -230,28 +364,22 @@ class GridEnvironment:
         [0,-1] [Agent] [0,1]
         [1,-1] [1,0] [1,1]
         
+        Args:
+            out: Optional float32 array of 8 values to write the result into
+        
         Returns:
             numpy array of 8 values (0=walkable, 1=obstacle)
         """
-        #List to store surrounding cell information
-        surrounding = []
+        #All 8 values were precomputed in __init__, so this is one table lookup
+        surrounding = self._surround_table[self.agent_pos[0], self.agent_pos[1]]
         
-        #Check all 8 adjacent cells (up, down, left, right, and diagonals)
-        for dx, dy in [(-1,-1), (-1,0), (-1,1), (0,-1), (0,1), (1,-1), (1,0), (1,1)]:
-            #Calculate the position of this adjacent cell
-            new_pos = self.agent_pos + np.array([dx, dy])
-            
-            #Check if this adjacent cell is within bounds
-            if self._is_valid(new_pos):
-                #Check if the cell is walkable (grid value != 0)
-                #0.0 = walkable, 1.0 = obstacle
-                surrounding.append(0.0 if self.grid[new_pos[0], new_pos[1]] != 0 else 1.0)
-            else:
-                #Out of bounds = treat as obstacle
-                surrounding.append(1.0)
+        #Copy into the caller's buffer if given
+        if out is not None:
+            out[:] = surrounding
+            return out
         
-        #Convert list to numpy array
-        return np.array(surrounding)
+        #Otherwise return a copy so the table cannot be modified through it
+        return surrounding.copy()
     
     def _is_valid(self, pos):
         """
@@ -282,58 +410,214 @@ class GridEnvironment:
             - reward: Scalar reward for this action
             - done: Boolean indicating if episode is over
         """
+        reward, done = self.move(action)
+        return self._get_state(), reward, done
+    
+    def move(self, action):
+        """
+        Execute one action without building the next state
+        
+        Same as step() for callers that read the state another way
+        (fill_state_into), so no state tensor is created per step.
+        
+        Args:
+            action: Integer 0-3 (up, down, left, right)
+        
+        Returns:
+            Tuple of (reward, done)
+        """
         #Increment step counter (for episode timeout)
         self.step_count += 1
         
         #Calculate where the agent would be after this action
-        new_pos = self.agent_pos + np.array(self.actions[action])
+        move_row, move_col = self.actions[action]
+        new_row = self.agent_pos[0] + move_row
+        new_col = self.agent_pos[1] + move_col
         
         #===== Check if move is out of bounds =====
-        if not self._is_valid(new_pos):
+        #Same check as _is_valid, inlined to skip a method call every step
+        rows, cols = self.grid_size
+        if not (0 <= new_row < rows and 0 <= new_col < cols):
             #Out of bounds is bad - give large negative reward
             reward = -100
             
             #Episode continues (agent can try another action)
             done = False
             
-            #Return current state (agent didn't move), reward, and done flag
-            return self._get_state(), reward, done
+            #Agent didn't move, return reward and done flag
+            return reward, done
         
         #===== Check if moving into a wall =====
-        if self.grid[new_pos[0], new_pos[1]] == 1:
+        if self._wall_mask[new_row, new_col]:
             #Hitting a wall is bad - give large negative reward
             reward = -80
             
             #Episode continues
             done = False
             
-            return self._get_state(), reward, done
+            return reward, done
         
         #===== Valid move - update agent position =====
-        self.agent_pos = new_pos
+        self.agent_pos = (new_row, new_col)
         
         #===== Check if reached the goal =====
-        if np.array_equal(self.agent_pos, self.goal_pos):
+        #Plain tuple comparison of two ints, no numpy call needed
+        if self.agent_pos == self.goal_pos:
             #Success! Give huge positive reward
             reward = 250
             
             #Episode is done (goal reached)
             done = True
             
-            return self._get_state(), reward, done
+            return reward, done
         
         #===== Calculate reward for moving in open space =====
         #Base penalty: -3 per step (encourages finding shortest path)
         #Distance bonus: Negative of distance to goal (encourages moving closer)
-        distance_reward = -np.linalg.norm(self.agent_pos - self.goal_pos) * 0.1
+        #math.hypot on the two int differences is the same Euclidean distance without numpy
+        distance_reward = -math.hypot(self.agent_pos[0] - self.goal_pos[0],
+                                      self.agent_pos[1] - self.goal_pos[1]) * 0.1
         reward = -3 + distance_reward
         
         #===== Check if episode timed out =====
         #If agent has taken too many steps, end episode (learning failed)
         done = self.step_count >= self.max_steps
         
-        #Return new state, calculated reward, and done flag
-        return self._get_state(), reward, done
+        #Return calculated reward and done flag
+        return reward, done
+
+#==================== VECTORIZED ENVIRONMENT ====================
+
+class VectorGridEnvironment:
+    """
+    N copies of GridEnvironment on the same grid, stepped together
+    
+    Positions are stored as [N, 2] arrays (structure of arrays) and every
+    step is a handful of numpy operations over all N environments, so one
+    network forward of shape [N, 12] can choose actions for all of them.
+    Rewards and episode endings follow GridEnvironment.step exactly.
+    """
+    
+    #Action -> (row change, col change), same order as GridEnvironment.actions
+    ACTIONS = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)])
+    
+    def __init__(self, grid, starts, goals, max_steps=300):
+        """
+        Initialize N environments
+        
+        Args:
+            grid: 2D list where 0=walkable, 1=wall, other=item
+            starts: Sequence of N (row, col) start positions
+            goals: Sequence of N (row, col) goal positions
+            max_steps: Maximum steps allowed in an episode (300)
+        """
+        #Grid, wall mask and surrounding-cell table, shared by all environments
+        self.grid = np.array(grid)
+        self.grid_size = self.grid.shape
+        self._wall_mask = self.grid == 1
+        self._surround_table = build_surround_table(self.grid == 0)
+        
+        #Per-environment state, one row per environment
+        self.starts = np.array(starts, dtype=np.int64).reshape(-1, 2)
+        self.goal_pos = np.array(goals, dtype=np.int64).reshape(-1, 2)
+        self.num_envs = len(self.starts)
+        self.agent_pos = self.starts.copy()
+        self.step_count = np.zeros(self.num_envs, dtype=np.int64)
+        self.max_steps = max_steps
+    
+    def set_episode_targets(self, index, new_start, new_target_pos):
+        """
+        Change the start and goal of one environment (takes effect on its next reset)
+        
+        Args:
+            index: Environment number
+            new_start: Tuple (row, col) for new starting position
+            new_target_pos: Tuple (row, col) for new target position
+        """
+        self.starts[index] = new_start
+        self.goal_pos[index] = new_target_pos
+    
+    def reset(self, mask=None):
+        """
+        Reset all environments, or only those selected by mask
+        
+        Args:
+            mask: Optional boolean array [N], True for environments to reset
+        
+        Returns:
+            States of all environments, tensor [N, 12]
+        """
+        if mask is None:
+            mask = slice(None)
+        
+        #Move agents back to their start positions and reset their step counters
+        self.agent_pos[mask] = self.starts[mask]
+        self.step_count[mask] = 0
+        return self._get_states()
+    
+    def _get_states(self):
+        """
+        Build the state of every environment in one pass
+        State = [agent_row, agent_col, goal_row, goal_col, 8 surrounding cells]
+        
+        Returns:
+            PyTorch tensor with shape [N, 12]
+        """
+        states = np.empty((self.num_envs, 12), dtype=np.float32)
+        states[:, 0:2] = self.agent_pos
+        states[:, 2:4] = self.goal_pos
+        
+        #One fancy-index gathers the surroundings of all agents
+        states[:, 4:12] = self._surround_table[self.agent_pos[:, 0], self.agent_pos[:, 1]]
+        return torch.from_numpy(states)
+    
+    def step(self, actions):
+        """
+        Execute one action in every environment
+        
+        Environments are not reset automatically: reset(dones) starts new
+        episodes for the ones that finished.
+        
+        Args:
+            actions: Integer array [N] of actions 0-3 (up, down, left, right)
+        
+        Returns:
+            Tuple of (next_states, rewards, dones)
+            - next_states: Tensor [N, 12]
+            - rewards: float32 array [N]
+            - dones: Boolean array [N]
+        """
+        self.step_count += 1
+        
+        #Where each agent would be after its action
+        new_pos = self.agent_pos + self.ACTIONS[actions]
+        
+        #Out of bounds and wall checks for all environments at once
+        rows, cols = self.grid_size
+        out_of_bounds = ~((new_pos[:, 0] >= 0) & (new_pos[:, 0] < rows) &
+                          (new_pos[:, 1] >= 0) & (new_pos[:, 1] < cols))
+        
+        #Clip only for the lookup, out of bounds agents are masked off anyway
+        wall = ~out_of_bounds & self._wall_mask[np.clip(new_pos[:, 0], 0, rows - 1),
+                                                 np.clip(new_pos[:, 1], 0, cols - 1)]
+        
+        #Valid moves update the position
+        moved = ~(out_of_bounds | wall)
+        self.agent_pos[moved] = new_pos[moved]
+        
+        #Goal reached, and Euclidean distance to the goal for the step penalty
+        reached = moved & (self.agent_pos == self.goal_pos).all(axis=1)
+        distance = np.hypot(*(self.agent_pos - self.goal_pos).T)
+        
+        #Same rewards as GridEnvironment.step: -100 out of bounds, -80 wall, 250 goal, else -3 - 0.1 * distance
+        rewards = np.where(out_of_bounds, -100.0,
+                  np.where(wall, -80.0,
+                  np.where(reached, 250.0, -3.0 - distance * 0.1))).astype(np.float32)
+        
+        #Episodes end at the goal, or on timeout after a valid move (blocked moves never end an episode)
+        dones = reached | (moved & (self.step_count >= self.max_steps))
+        
+        return self._get_states(), rewards, dones
 
 #==================== DQN AGENT ====================
 
@@ -345,10 +629,10 @@ class DQNAgent:
     - Stores experiences (state, action, reward, next_state, done)
     - Trains the network using experience replay
     - Uses epsilon-greedy exploration
-    - Maintains both main and target networks for stability
+    - Maintains both main and target networks for stability (Double DQN targets)
     """
     
-    def __init__(self, state_size, action_size, learning_rate=0.001):
+    def __init__(self, state_size, action_size, learning_rate=0.001, use_cuda_graph=False, use_compile=False):
         """
         Initialize the DQN agent
         
@@ -356,6 +640,8 @@ class DQNAgent:
             state_size: Size of state vector (12 in our case)
             action_size: Number of possible actions (4 in our case)
             learning_rate: Learning rate for optimizer (0.001)
+            use_cuda_graph: Capture the replay() training step as a CUDA graph (GPU only, off by default)
+            use_compile: Compile the training loss with torch.compile instead of TorchScript (off by default)
         """
         #Size of input state
         self.state_size = state_size
@@ -363,9 +649,31 @@ class DQNAgent:
         #Number of possible actions
         self.action_size = action_size
         
+        #Check if GPU is available
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        
         #Experience replay buffer - stores up to 10,000 experiences
-        #When full, oldest experiences are forgotten
-        self.memory = deque(maxlen=10000)
+        #When full, oldest experiences are overwritten
+        #Stored as one preallocated tensor per field (structure of arrays)
+        #so a batch is sampled with a single index per field
+        #States are small non-negative integers (grid coordinates and 0/1 surroundings),
+        #so they are kept as uint8 (a quarter of float32) and converted when a batch is sampled
+        #(this limits grids to 256 rows and columns)
+        #The buffer lives on the training device, so states the environment builds there are stored
+        #and sampled without a copy between host and GPU (10,000 x 12 bytes per state field)
+        self.memory_size = 10000
+        self.states = torch.empty((self.memory_size, state_size), dtype=torch.uint8, device=self.device)
+        self.next_states = torch.empty((self.memory_size, state_size), dtype=torch.uint8, device=self.device)
+        self.actions = torch.empty(self.memory_size, dtype=torch.long, device=self.device)
+        self.rewards = torch.empty(self.memory_size, dtype=torch.float32, device=self.device)
+        self.dones = torch.empty(self.memory_size, dtype=torch.float32, device=self.device)
+        
+        #With a GPU, greedy actions are read back through pinned (page-locked) host memory
+        self._pin = torch.cuda.is_available()
+        
+        #Ring buffer cursor (next slot to write) and number of stored experiences
+        self.pos = 0
+        self.size = 0
         
         #Gamma (γ) - discount factor
         #0.95 means future rewards are worth 95% as much as immediate rewards
@@ -397,17 +705,202 @@ class DQNAgent:
         #Copy weights from main to target at initialization
         self.target_network.load_state_dict(self.network.state_dict())
         
+        #The target network is never trained directly, so autograd never needs to track it
+        #(load_state_dict still copies new weights in, it does not depend on requires_grad)
+        self.target_network.requires_grad_(False)
+        
+        #CUDA graph mode replays the whole training step as one launch
+        #Only possible on a GPU, otherwise replay() runs eagerly as usual
+        #use_compile already replays the step as CUDA graphs, so it takes precedence
+        self.use_cuda_graph = use_cuda_graph and torch.cuda.is_available() and not use_compile
+        self._graph = None
+        self._static_batch = None
+        
         #Create Adam optimizer for the main network
         #Adam adapts learning rate automatically for each parameter
-        self.optimizer = optim.Adam(self.network.parameters(), lr=learning_rate)
-        
-        #Check if GPU is available
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        #capturable=True keeps Adam's step counters on the GPU so optimizer.step() can be captured
+        self.optimizer = optim.Adam(self.network.parameters(), lr=learning_rate, capturable=self.use_cuda_graph)
         
         #Move both networks to GPU (if available) or CPU
         #This speeds up training on GPU
         self.network.to(self.device)
         self.target_network.to(self.device)
+        
+        #Loss of one training step, called by _train_step
+        self._loss_fn = self._compute_loss
+        
+        #torch.compile: TorchDynamo traces both forwards, the targets and the loss and Inductor
+        #fuses them into a few kernels ("reduce-overhead" also replays them as CUDA graphs on a GPU)
+        #The first replay() pays the compile time, so this only pays off for long training runs
+        #Dynamo cannot trace TorchScript modules, so the networks stay plain nn.Modules in this mode
+        self.use_compile = use_compile
+        if self.use_compile:
+            mode = "reduce-overhead" if self.device.type == "cuda" else "default"
+            self._loss_fn = torch.compile(self._compute_loss, mode=mode)
+        else:
+            #Compile both networks with TorchScript
+            #Removes the Python dispatch cost of each layer, mostly felt by act() which runs every step
+            #Scripted modules share their parameters with the originals, so the optimizer still updates them
+            #and state_dict()/load_state_dict() keep the same keys, so saved models load unchanged
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", FutureWarning)
+                self.network = torch.jit.script(self.network)
+                self.target_network = torch.jit.script(self.target_network)
+        
+        #Reusable [1, 12] state buffer on the device for greedy_action_from()
+        self._state_buf = torch.empty((1, state_size), dtype=torch.float32, device=self.device)
+        
+        #Reduced precision copy of the network used by act() once training is over
+        #None until prepare_inference() is called, so training always acts with the fp32 network
+        self.inference_net = None
+        self._inference_dtype = torch.float32
+        
+        #CUDA graph of the greedy forward on _state_buf, and the action tensor it writes
+        self._act_graph = None
+        self._act_out = None
+        
+        #Pinned host copy of the chosen action (and a numpy view of it) plus an event marking
+        #when the copy has landed, so reading the action waits on that copy only
+        if self._pin:
+            self._act_host = torch.empty(1, dtype=torch.long, pin_memory=True)
+            self._act_host_np = self._act_host.numpy()
+            self._act_ready = torch.cuda.Event()
+    
+    def prepare_inference(self, quantize_cpu=False):
+        """
+        Build a frozen, inference-only copy of the trained network for act()
+        
+        On GPU the copy runs in fp16. On CPU it stays fp32, or the Linear layers can
+        be dynamically quantized to int8; this is opt-in because at batch size 1 the
+        fp32 network is about as fast unless the CPU has int8 dot product instructions (VNNI).
+        Training keeps using the trainable network, so call this after training
+        (or after loading weights) and again if the weights change.
+        
+        Args:
+            quantize_cpu: Use an int8 copy when running on CPU (False)
+        """
+        #Plain (unscripted) copy of the current weights, quantization does not work on scripted modules
+        net = DQNNetwork(self.state_size, num_actions=self.action_size)
+        net.load_state_dict(self.network.state_dict())
+        net.eval()
+        net.requires_grad_(False)
+        
+        if self.device.type == "cuda":
+            #fp16 weights and inputs halve the memory traffic of the single-state forward
+            net = net.to(self.device).half()
+            self._inference_dtype = torch.float16
+        elif quantize_cpu:
+            #int8 weights, activations are quantized on the fly (input stays fp32)
+            net = torch.quantization.quantize_dynamic(net, {nn.Linear}, dtype=torch.qint8)
+            self._inference_dtype = torch.float32
+        else:
+            self._inference_dtype = torch.float32
+        
+        #Scripted like the training networks, eager quantized modules have a large per-call overhead
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", FutureWarning)
+            self.inference_net = torch.jit.script(net)
+        
+        #Freeze the weights in as constants and fold/fuse ops for inference (about 15% faster on CPU)
+        #Falls back to the plain scripted copy if a backend cannot optimize the module
+        try:
+            self.inference_net = torch.jit.optimize_for_inference(self.inference_net)
+        except RuntimeError as e:
+            warnings.warn(f"optimize_for_inference failed, using the unoptimized module: {e}", RuntimeWarning)
+        
+        #On a GPU, record the greedy forward as a CUDA graph so each step is a single launch
+        #If capture fails the eager forward is used
+        self._act_graph = None
+        if self.device.type == "cuda":
+            try:
+                self._capture_act_graph()
+            except RuntimeError:
+                self._act_graph = None
+    
+    def _capture_act_graph(self):
+        """
+        Capture the greedy forward (dtype cast, network, argmax) on _state_buf as a CUDA graph
+        
+        greedy_action_from() then only refills _state_buf in place and replays the graph.
+        """
+        #Warmup on a side stream so lazy initialisation (cuBLAS workspaces) is not captured
+        side_stream = torch.cuda.Stream()
+        side_stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(side_stream), torch.no_grad():
+            for _ in range(3):
+                self.inference_net(self._state_buf.to(self._inference_dtype)).argmax(dim=1)
+        torch.cuda.current_stream().wait_stream(side_stream)
+        
+        #_act_out is the graph's static output, overwritten by every replay
+        graph = torch.cuda.CUDAGraph()
+        with torch.no_grad(), torch.cuda.graph(graph):
+            self._act_out = self.inference_net(self._state_buf.to(self._inference_dtype)).argmax(dim=1)
+        self._act_graph = graph
+    
+    def greedy_action(self, state):
+        """
+        Pick the action with the highest Q-value (no exploration)
+        
+        Uses the reduced precision network from prepare_inference() if there is one.
+        
+        Args:
+            state: Current state [1, 12]
+        
+        Returns:
+            Action integer 0-3
+        """
+        #no_grad rather than inference_mode: the scripted network also runs with autograd in replay(),
+        #and TorchScript then rejects inference-mode inputs
+        with torch.no_grad():
+            if self.inference_net is not None:
+                q_values = self.inference_net(state.to(self.device, self._inference_dtype))
+            else:
+                q_values = self.network(state.to(self.device))
+            #q_values is [1, 4], so the flat argmax is the action (no per-dim shape handling)
+            return q_values.argmax().item()
+    
+    def greedy_actions(self, states):
+        """
+        Pick the action with the highest Q-value for a batch of states (no exploration)
+        
+        Args:
+            states: States tensor [N, 12]
+        
+        Returns:
+            numpy integer array [N] of actions 0-3
+        """
+        with torch.no_grad():
+            if self.inference_net is not None:
+                q_values = self.inference_net(states.to(self.device, self._inference_dtype))
+            else:
+                q_values = self.network(states.to(self.device))
+            return q_values.argmax(dim=1).cpu().numpy()
+    
+    def greedy_action_from(self, env):
+        """
+        Pick the best action for the environment's current state
+        
+        The state is written straight into a preallocated buffer on the agent's
+        device (env.fill_state_into), so no state tensor is created per call.
+        
+        Args:
+            env: GridEnvironment to read the current state from
+        
+        Returns:
+            Action integer 0-3
+        """
+        env.fill_state_into(self._state_buf)
+        
+        #GPU with a captured graph: replay it, then copy the action into pinned memory
+        #asynchronously and wait for that copy only (the one sync per step)
+        if self._act_graph is not None:
+            self._act_graph.replay()
+            self._act_host.copy_(self._act_out, non_blocking=True)
+            self._act_ready.record()
+            self._act_ready.synchronize()
+            return int(self._act_host_np[0])
+        
+        return self.greedy_action(self._state_buf)
     
     def remember(self, state, action, reward, next_state, done):
         """
@@ -423,9 +916,17 @@ class DQNAgent:
             next_state: State after action
             done: Whether episode ended
         """
-        #Append the experience tuple to the memory buffer
-        #The deque automatically forgets old experiences when full
-        self.memory.append((state, action, reward, next_state, done))
+        #Write the experience into the current ring buffer slot
+        #State tensors are [1, 12], so flatten them into the [12] row
+        self.states[self.pos] = state.view(-1)
+        self.actions[self.pos] = action
+        self.rewards[self.pos] = reward
+        self.next_states[self.pos] = next_state.view(-1)
+        self.dones[self.pos] = float(done)
+        
+        #Advance the cursor, wrapping round to overwrite the oldest experience when full
+        self.pos = (self.pos + 1) % self.memory_size
+        self.size = min(self.size + 1, self.memory_size)
     
     def act(self, state):
         """
@@ -447,19 +948,54 @@ class DQNAgent:
             return random.randrange(self.action_size)
         
         #Exploitation: use network to pick best action
-        #torch.no_grad disables gradient computation (we're not training here)
-        with torch.no_grad():
-            #Move state to GPU/CPU where network is
-            state_tensor = state.to(self.device)
-            
-            #Get Q-values for all actions from network
-            #Output shape: [1, 4] (1 state, 4 actions)
-            q_values = self.network(state_tensor)
-            
-            #Find the action with highest Q-value
-            #argmax(dim=1) finds max along action dimension
-            #.item() converts tensor to Python number
-            return q_values.argmax(dim=1).item()
+        #(the reduced precision copy once prepare_inference() has been called)
+        return self.greedy_action(state)
+    
+    def remember_batch(self, states, actions, rewards, next_states, dones):
+        """
+        Store one experience per environment from a VectorGridEnvironment step
+        
+        Args:
+            states: States before the actions [N, 12]
+            actions: Actions taken [N]
+            rewards: Rewards received [N]
+            next_states: States after the actions [N, 12]
+            dones: Whether each episode ended [N]
+        """
+        #Ring buffer slots for the N experiences, wrapping round when full
+        slots = (self.pos + torch.arange(len(actions), device=self.device)) % self.memory_size
+        
+        #One indexed write per field
+        self.states[slots] = states.to(self.device, self.states.dtype)
+        self.actions[slots] = torch.as_tensor(actions, dtype=torch.long).to(self.device)
+        self.rewards[slots] = torch.as_tensor(rewards, dtype=torch.float32).to(self.device)
+        self.next_states[slots] = next_states.to(self.device, self.next_states.dtype)
+        self.dones[slots] = torch.as_tensor(dones, dtype=torch.float32).to(self.device)
+        
+        #Advance the cursor past the new experiences
+        self.pos = (self.pos + len(actions)) % self.memory_size
+        self.size = min(self.size + len(actions), self.memory_size)
+    
+    def act_batch(self, states):
+        """
+        Choose an action for every environment using epsilon-greedy strategy
+        
+        One network forward of shape [N, 12] covers all environments; each one
+        then explores with probability epsilon independently.
+        
+        Args:
+            states: States of all environments [N, 12]
+        
+        Returns:
+            numpy integer array [N] of actions 0-3
+        """
+        #Greedy actions for all environments from a single forward pass
+        actions = self.greedy_actions(states)
+        
+        #Replace the actions of exploring environments with random ones
+        explore = np.random.random(len(actions)) < self.epsilon
+        actions[explore] = np.random.randint(0, self.action_size, explore.sum())
+        return actions
     
     def replay(self, batch_size):
         """
@@ -472,39 +1008,67 @@ class DQNAgent:
         4. Compute loss between them
         5. Update network weights via backpropagation
         
+        The caller must check there are at least batch_size stored experiences
+        (self.size >= batch_size) before calling, so the hot path has no warmup branch.
+        
         Args:
             batch_size: Number of experiences to sample (32)
         """
-        #Check if we have enough experiences to form a batch
-        if len(self.memory) < batch_size:
-            #Not enough data yet, can't train
-            return
-        
-        #Randomly sample a batch from replay buffer
+        #Randomly sample batch indices from the filled part of the replay buffer
         #This breaks temporal correlation between experiences
-        batch = random.sample(self.memory, batch_size)
-        
-        #Extract each component from the batch
-        #Instead of list of tuples, create separate tensors for each component
-        
-        #Concatenate all states into one tensor [batch_size, 12]
-        states = torch.cat([exp[0] for exp in batch]).to(self.device)
+        idx = torch.randint(0, self.size, (batch_size,), device=self.device)
+        
+        #Gather each component with one index per field
+        #states/next_states: [batch_size, 12]
+        #actions: [batch_size], dtype=torch.long because actions are integers
+        #rewards: [batch_size]
+        #dones: [batch_size], 1.0 if episode ended, 0.0 if episode continues
+        batch = self._sample_batch(idx)
+        
+        #Run the training step, as a captured CUDA graph if enabled
+        if self.use_cuda_graph:
+            self._graph_step(batch)
+        else:
+            self._train_step(*batch)
+    
+    def _train_step(self, states, actions, rewards, next_states, dones):
+        """
+        One DQN update on a sampled batch (steps 2-5 of replay)
         
-        #Create tensor of actions taken [batch_size]
-        #dtype=torch.long because actions are integers
-        actions = torch.tensor([exp[1] for exp in batch], dtype=torch.long).to(self.device)
+        Args:
+            states: States tensor [batch_size, 12]
+            actions: Actions tensor [batch_size]
+            rewards: Rewards tensor [batch_size]
+            next_states: Next states tensor [batch_size, 12]
+            dones: Done flags tensor [batch_size]
+        """
+        #Forward passes, targets and loss (torch.compile'd when use_compile is set)
+        loss = self._loss_fn(states, actions, rewards, next_states, dones)
         
-        #Create tensor of rewards received [batch_size]
-        #dtype=torch.float32 for numerical computation
-        rewards = torch.tensor([exp[2] for exp in batch], dtype=torch.float32).to(self.device)
+        #===== Backpropagation & Weight Update =====
+        #Clear old gradients from previous training step
+        #Without this, gradients would accumulate
+        self.optimizer.zero_grad()
         
-        #Concatenate all next states [batch_size, 12]
-        next_states = torch.cat([exp[3] for exp in batch]).to(self.device)
+        #Backpropagation: compute gradients of loss with respect to weights
+        #Tells us how much each weight contributed to the error
+        loss.backward()
         
-        #Create tensor of done flags [batch_size]
-        #1.0 if episode ended, 0.0 if episode continues
-        dones = torch.tensor([exp[4] for exp in batch], dtype=torch.float32).to(self.device)
+        #Adam optimizer step: update weights in direction of negative gradient
+        #This reduces loss, making predictions more accurate
+        self.optimizer.step()
+    
+    def _compute_loss(self, states, actions, rewards, next_states, dones):
+        """
+        DQN loss on a sampled batch (steps 2-4 of replay)
         
+        Args:
+            states: States tensor [batch_size, 12]
+            actions: Actions tensor [batch_size]
+            rewards: Rewards tensor [batch_size]
+            next_states: Next states tensor [batch_size, 12]
+            dones: Done flags tensor [batch_size]
+        """
         #===== Calculate Q-values for actions taken =====
         #Main Network
         #Get Q-values for all actions from current states
@@ -517,40 +1081,101 @@ class DQNAgent:
         q_values = q_values.gather(1, actions.unsqueeze(1)).squeeze(1)
         
         #===== Calculate Target Q-values =====
-        #Target Network
-        #Get Q-values for all actions from next states using target network
-        #target_network output shape: [batch_size, 4]
-        next_q_values = self.target_network(next_states)
-        
-        #Take the maximum Q-value for each next state
-        #This is the best action the agent could take
-        #max(dim=1)[0] gets the values, [1] would get indices
-        #Result shape: [batch_size]
-        next_q_values = next_q_values.max(dim=1)[0]
-        
-        #===== Apply Bellman Equation =====
-        #Q(s,a) = r + γ * max(Q(s',a')) * (1 - done)
-        #If episode ended (done=1), target is just the reward
-        #If episode continues (done=0), include future value
-        target_q_values = rewards + self.gamma * next_q_values * (1 - dones)
+        #Targets are constants for the loss, so no autograd graph is recorded for them
+        with torch.no_grad():
+            #Double DQN
+            #Main network picks the best next action, target network scores it
+            #Separating selection from evaluation stops the max from over-estimating Q-values
+            #next_actions shape: [batch_size, 1]
+            next_actions = self.network(next_states).argmax(dim=1, keepdim=True)
+            
+            #Target Network
+            #Q-value of the chosen next action for each next state
+            #.gather picks column next_actions[i] from row i
+            #Result shape: [batch_size]
+            next_q_values = self.target_network(next_states).gather(1, next_actions).squeeze(1)
+            
+            #===== Apply Bellman Equation =====
+            #Q(s,a) = r + γ * Q_target(s', argmax_a' Q(s',a')) * (1 - done)
+            #If episode ended (done=1), target is just the reward
+            #If episode continues (done=0), include future value
+            target_q_values = rewards + self.gamma * next_q_values * (1 - dones)
         
         #===== Calculate Loss =====
         #Mean Squared Error between predicted and target Q-values
         #This measures how wrong our predictions are
-        loss = nn.MSELoss()(q_values, target_q_values)
+        #F.mse_loss is the functional form, so no loss module is built every step
+        return F.mse_loss(q_values, target_q_values)
+    
+    def _graph_step(self, batch):
+        """
+        Run the training step by replaying a captured CUDA graph
         
-        #===== Backpropagation & Weight Update =====
-        #Clear old gradients from previous training step
-        #Without this, gradients would accumulate
-        self.optimizer.zero_grad()
+        The graph is captured on the first call. Every later call copies the new
+        batch into the graph's static input tensors and replays all kernels
+        (forward, target forward, loss, backward, Adam step) in a single launch.
         
-        #Backpropagation: compute gradients of loss with respect to weights
-        #Tells us how much each weight contributed to the error
-        loss.backward()
+        Args:
+            batch: Tuple of (states, actions, rewards, next_states, dones) on the GPU
+        """
+        #First call: record the graph
+        if self._graph is None:
+            self._capture_graph(batch)
         
-        #Adam optimizer step: update weights in direction of negative gradient
-        #This reduces loss, making predictions more accurate
-        self.optimizer.step()
+        #The graph is recorded for one batch size, other sizes train eagerly
+        elif batch[0].shape[0] != self._static_batch[0].shape[0]:
+            self._train_step(*batch)
+            return
+        
+        #Copy the sampled batch into the tensors the graph reads from, then replay it
+        for static, new in zip(self._static_batch, batch):
+            static.copy_(new)
+        self._graph.replay()
+    
+    def _capture_graph(self, batch):
+        """
+        Capture _train_step as a CUDA graph, using batch as the static inputs
+        
+        A few warmup steps run first on a side stream (as PyTorch requires),
+        so the first batch is trained on a few extra times.
+        
+        Args:
+            batch: Tuple of (states, actions, rewards, next_states, dones) on the GPU
+        """
+        #Static input tensors, refilled in place before every replay
+        self._static_batch = tuple(t.clone() for t in batch)
+        
+        #Warmup on a side stream so lazy initialisation (Adam state, workspaces) is not captured
+        side_stream = torch.cuda.Stream()
+        side_stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(side_stream):
+            for _ in range(3):
+                self._train_step(*self._static_batch)
+        torch.cuda.current_stream().wait_stream(side_stream)
+        
+        #Record forward, backward and optimizer step into the graph
+        #Gradients are set to None first so backward allocates them from the graph's memory pool
+        self.optimizer.zero_grad(set_to_none=True)
+        self._graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(self._graph):
+            self._train_step(*self._static_batch)
+    
+    def _sample_batch(self, idx):
+        """
+        Gather the experiences at idx from every replay field
+        
+        The replay buffer is already on self.device, so this is one fancy-index
+        per field. The uint8 states are converted to float32 only for the sampled batch.
+        
+        Args:
+            idx: Long tensor of buffer indices to sample, on self.device
+        
+        Returns:
+            Tuple of (states, actions, rewards, next_states, dones) on self.device
+        """
+        states, actions, rewards, next_states, dones = (
+            field[idx] for field in (self.states, self.actions, self.rewards, self.next_states, self.dones))
+        return states.float(), actions, rewards, next_states.float(), dones
     
     def update_target_network(self):
         """
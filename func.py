@@ -4,7 +4,6 @@ Various helper functions for the warehouse manager application.
 """
 
 import sqlite3
-from tabulate import tabulate
 import time
 import random
 from db_func import *
@@ -51,6 +50,7 @@ def stock_check():
     Perform a stock check to identify low stock items and expiring items.
     Prints a table of low stock items and expiring items, and takes action on expired items.
     """
+    from tabulate import tabulate
     # Function to perform stock check
     cursor.execute("SELECT itemID, quantity FROM stock WHERE quantity < 50;")
     low_stock_items = cursor.fetchall()
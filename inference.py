@@ -9,13 +9,13 @@ import os
 import json
 import numpy as np
 
-from dqn_model import DQNAgent, GridEnvironment
+from dqn_model import DQNAgent, GridEnvironment, VectorGridEnvironment
 from setGrid import generate_warehouse, get_warehouse_grid
 
 
 #==================== LOAD FUNCTION ====================
 
-def load_agent(state_size, action_size, filepath):
+def load_agent(state_size, action_size, filepath, quantize=False):
     """
     Load a trained agent from a saved model file
     
@@ -23,6 +23,7 @@ def load_agent(state_size, action_size, filepath):
         state_size: Size of state vector (12 in our case)
         action_size: Number of possible actions (4 in our case)
         filepath: Path to the saved model file
+        quantize: Run CPU inference with int8 weights (False, only faster on CPUs with VNNI)
     
     Returns:
         The loaded DQNAgent object, or None if loading failed
@@ -34,8 +35,20 @@ def load_agent(state_size, action_size, filepath):
         return None
     
     try:
-        agent.network.load_state_dict(torch.load(filepath, weights_only=True))
+        #Memory-map the file and place the weights straight on the agent's device
+        #(the saved models may have been written on a GPU, so map_location is also needed to load them on CPU)
+        #assign=True adopts the loaded tensors as the parameters instead of copying into them
+        state_dict = torch.load(filepath, weights_only=True, map_location=agent.device, mmap=True)
+        agent.network.load_state_dict(state_dict, assign=True)
         agent.network.eval()
+        
+        #Inference only: no autograd bookkeeping for the weights
+        #(per parameter, ScriptModules do not support Module.requires_grad_)
+        for param in agent.network.parameters():
+            param.requires_grad_(False)
+        
+        #Frozen TorchScript copy of the network for the per-step forward (fp16 on GPU, int8 on CPU if quantize)
+        agent.prepare_inference(quantize_cpu=quantize)
         print(f"Agent loaded from {filepath}")
         return agent
     except Exception as e:
@@ -45,6 +58,7 @@ def load_agent(state_size, action_size, filepath):
 
 #==================== INFERENCE FUNCTION ====================
 
+@torch.no_grad()
 def find_path(agent, env, start, target_item, max_steps=100):
     """
     Use the trained agent to find a path from start to target
@@ -61,19 +75,22 @@ def find_path(agent, env, start, target_item, max_steps=100):
         - path: List of positions visited
         - total_reward: Sum of all rewards
     """
-    state = env.reset()
-    path = [tuple(env.agent_pos)]
+    env.reset()
+    #agent_pos is an immutable (row, col) tuple of ints, so it is stored as is without a copy
+    path = [env.agent_pos]
     total_reward = 0
     
+    # Bound methods looked up once, the loop body then only uses locals
+    choose_action = agent.greedy_action_from
+    move = env.move
+    add_position = path.append
+    
     for step in range(max_steps):
-        with torch.no_grad():
-            q_values = agent.network(state.to(agent.device))
-            action = q_values.argmax(dim=1).item()
+        action = choose_action(env)
         
-        next_state, reward, done = env.step(action)
-        path.append(tuple(env.agent_pos))
+        reward, done = move(action)
+        add_position(env.agent_pos)
         total_reward += reward
-        state = next_state
         
         if done:
             break
@@ -81,37 +98,90 @@ def find_path(agent, env, start, target_item, max_steps=100):
     return path, total_reward
 
 
+@torch.no_grad()
+def find_paths_batched(agent, grid, start_positions, target_items, max_steps=100):
+    """
+    Find paths for several (start, target) queries at once
+    
+    All queries step together in a VectorGridEnvironment, so each step is one
+    network forward over all still running queries instead of one per query.
+    
+    Args:
+        agent: The trained DQNAgent object
+        grid: 2D grid (0=walkable, 1=wall, other=shelf/item)
+        start_positions: List of starting positions (row, col)
+        target_items: List of item numbers to find, one per start
+        max_steps: Maximum steps to take (100 default)
+    
+    Returns:
+        List of (path, total_reward) tuples, one per query, as returned by find_path
+    """
+    grid_np = np.array(grid)
+    
+    #Goal of each query is the first cell holding its item, or its start if the item is missing
+    goals = []
+    for start, item in zip(start_positions, target_items):
+        hits = np.argwhere(grid_np == item)
+        goals.append(tuple(hits[0]) if hits.size else tuple(start))
+    
+    #Episodes never time out inside the environment, max_steps is enforced here like find_path
+    env = VectorGridEnvironment(grid, start_positions, goals, max_steps=max_steps + 1)
+    states = env.reset()
+    
+    #Positions of every query at every step, one vectorized write per step
+    #lengths holds how many positions of each query belong to its path
+    positions = np.empty((max_steps + 1, env.num_envs, 2), dtype=np.int64)
+    positions[0] = env.agent_pos
+    lengths = np.ones(env.num_envs, dtype=np.int64)
+    total_rewards = np.zeros(env.num_envs)
+    running = np.ones(env.num_envs, dtype=bool)
+    
+    for step in range(max_steps):
+        #One forward for every query, finished queries keep stepping but are ignored
+        actions = agent.greedy_actions(states)
+        states, rewards, dones = env.step(actions)
+        
+        #Record the step for queries that were still running
+        positions[step + 1] = env.agent_pos
+        lengths += running
+        total_rewards[running] += rewards[running]
+        
+        running &= ~dones
+        if not running.any():
+            break
+    
+    #Convert to lists of (row, col) tuples only at the end, the format find_path returns
+    return [([tuple(pos) for pos in positions[:lengths[i], i].tolist()], float(total_rewards[i]))
+            for i in range(env.num_envs)]
+
+
 #==================== VISUALIZATION FUNCTION ====================
 
 def visualize_path(grid, path, target_item):
     """Display grid with path marked as S (start), - (path), G (goal)"""
-    import numpy as np
-    
-    # Create a copy of the grid
-    grid_copy = [row[:] for row in grid]
+    # Copy of the grid as an object array, so cells can hold numbers or marker strings
+    grid_copy = np.array(grid, dtype=object)
     
     # Mark start position FIRST
     if path:
-        start_pos = path[0]
-        grid_copy[start_pos[0]][start_pos[1]] = "S"
+        grid_copy[path[0][0], path[0][1]] = "S"
     
-    # Mark intermediate path positions
-    for i in range(1, len(path) - 1):
-        pos = path[i]
-        grid_copy[pos[0]][pos[1]] = "-"
+    # Mark intermediate path positions, all in one fancy-indexed write
+    if len(path) > 2:
+        rows, cols = np.array(path[1:-1]).T
+        grid_copy[rows, cols] = "-"
     
     # Mark goal position LAST (only if different from start)
     if len(path) > 1:
         goal_pos = path[-1]
-        if not np.array_equal(goal_pos, path[0]):
-            grid_copy[goal_pos[0]][goal_pos[1]] = "G"
+        if tuple(goal_pos) != tuple(path[0]):
+            grid_copy[goal_pos[0], goal_pos[1]] = "G"
         else:
-            grid_copy[goal_pos[0]][goal_pos[1]] = "S/G"
+            grid_copy[goal_pos[0], goal_pos[1]] = "S/G"
     
-    # Print the visualization
+    # Print the visualization in a single call
     print("\nVisualization (S = start, - = path, G = goal):")
-    for row in grid_copy:
-        print(' '.join(str(cell) for cell in row))
+    print('\n'.join(' '.join(str(cell) for cell in row) for row in grid_copy))
 
 
 #==================== ACTION NAMES ====================
@@ -126,7 +196,19 @@ ACTION_NAMES = {
 
 #==================== MAIN ====================
 
-if __name__ == "__main__":
+# Environment built by the last run_inference call, reused by the next one
+_env = None
+
+def run_inference(agent=None):
+    """
+    Load the grid and model, find a path to the target item and print it
+    
+    Args:
+        agent: An already loaded DQNAgent to reuse, or None to load it from models/
+    
+    Returns:
+        The DQNAgent used (pass it back in to skip reloading), or None on failure
+    """
     # Setup
     print("=" * 60)
     print("DQN PATHFINDING - INFERENCE")
@@ -163,18 +245,27 @@ if __name__ == "__main__":
     if not os.path.exists(model_path):
         print(f"Model not found at {model_path}")
         print("Please run train.py first to train the model.")
-        exit()
-    
-    # Load the trained model
-    print(f"Loading trained model from {model_path}...")
-    agent = load_agent(state_size=12, action_size=4, filepath=model_path)
+        return None
     
+    # Load the trained model, unless the caller already has it loaded
     if agent is None:
-        print("Failed to load model. Exiting.")
-        exit()
+        print(f"Loading trained model from {model_path}...")
+        agent = load_agent(state_size=12, action_size=4, filepath=model_path)
+        
+        if agent is None:
+            print("Failed to load model.")
+            return None
     
-    # Create environment for inference
-    env = GridEnvironment(grid, start_pos, target_item)
+    # Create environment for inference, building states on the agent's device
+    # so find_path never copies a state host-to-device (the action is the only sync per step)
+    # The environment of the previous call is reused while the grid is unchanged
+    global _env
+    if (_env is not None and _env.device == agent.device
+            and _env.grid.shape == np.shape(grid) and np.array_equal(_env.grid, grid)):
+        _env.reconfigure(start_pos, target_item)
+    else:
+        _env = GridEnvironment(grid, start_pos, target_item, device=agent.device)
+    env = _env
     
     # Find a path using the trained agent
     print("\nRunning inference...")
@@ -202,4 +293,10 @@ if __name__ == "__main__":
     else:
         print("No path found (agent did not move).")
     
-    print("=" * 60)
\ No newline at end of file
+    print("=" * 60)
+    
+    return agent
+
+
+if __name__ == "__main__":
+    run_inference()
@@ -5,8 +5,10 @@
 import sqlite3
 from db_func import *
 
-db_connect()
-reset_tables()
-create_tables()
-init_database()
-db_close()
\ No newline at end of file
+if __name__ == "__main__":
+    db_connect()
+    reset_tables()
+    create_tables()
+    init_database()
+    create_indexes()
+    db_close()
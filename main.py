@@ -10,6 +10,9 @@ from setGrid import *
 from search import a_star_search
 from func import *
 
+# Trained pathfinding agent, loaded by the first "Find item" search
+agent = None
+
 print('---------------------WAREHOUSE MANAGER-----------------------\n')
 print("Welcome to Warehouse Manager!\n")
 
@@ -100,14 +103,16 @@ while True:
         case 10:
             print("-----------------Find item in warehouse-----------------\n")
             # Call function to find item in warehouse
-            #run inference.py
-            import os
-            os.system("python inference.py")
-            print("Inference complete. Check 'grid_data1.json' for results.\n")
+            # Run inference in this process, imported on first use so the menu starts without PyTorch
+            # The loaded agent is kept for later searches, so the model is only loaded once
+            from inference import run_inference
+            agent = run_inference(agent)
+            print("Inference complete.\n")
         case 0:
             print("EXITING\n")
+            db_close()
             exit(0)
         case _:
             print("Invalid choice. Please choose again.\n")
 
-db_close(conn)
\ No newline at end of file
+db_close()
\ No newline at end of file
@@ -2,7 +2,8 @@ from dataclasses import dataclass
 import time
 
 
-@dataclass
+# slots: no per-instance __dict__, so robots are smaller and attribute access is faster
+@dataclass(slots=True)
 class Robot:
 
     # Simple warehouse robot model 
@@ -6,6 +6,7 @@ Implement A* search algorithm for pathfinding in a warehouse grid.
 # Imports
 import time
 import heapq
+from collections import deque
 
 '''
 search algorithm
@@ -27,25 +28,47 @@ def manhattan (a, b):
     """
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
+def pack_grid(grid):
+    """
+    Packs a grid into a flat bytearray surrounded by a one cell border of obstacles,
+    so neighbour lookups never need a bounds check. Cell (x, y) is stored at
+    (y + 1) * (width + 2) + x + 1.
+    Returns (cells, width, height); already packed grids are returned unchanged.
+    
+    :param grid: List of Lists representing the grid, or a packed grid
+    """
+    if isinstance(grid, tuple):
+        return grid
+    width = len(grid[0])
+    height = len(grid)
+    stride = width + 2
+
+    cells = bytearray(b'\x01' * (stride * (height + 2)))
+    for y, row in enumerate(grid):
+        start = (y + 1) * stride + 1
+        cells[start:start + width] = bytes(row)
+    return cells, width, height
+
 def nearest_aisle(grid, start, goal):
     """
     Finds the nearest aisle space to the goal space with respect to the start space.
     
-    :param grid: List of Lists representing the grid
+    :param grid: List of Lists representing the grid, or a packed grid
     :param start: Tuple representing the start point (x, y)
     :param goal: Tuple representing the goal point (x, y)
     """
+    cells, width, height = pack_grid(grid)
     gx,gy = goal
-    width = len(grid[0])
+    goal_index = (gy + 1) * (width + 2) + gx + 1
 
     candidates = []
 
-    #left of shelf
-    if gx - 1 >= 0 and grid[gy][gx-1]== 0:
+    #left of shelf (the border is an obstacle, so no bounds check is needed)
+    if cells[goal_index - 1] == 0:
         candidates.append((gx - 1, gy))
 
     #right of shelf
-    if gx + 1 < width and grid[gy][gx + 1] == 0:
+    if cells[goal_index + 1] == 0:
         candidates.append((gx + 1, gy))
 
     #check for empty candidates
@@ -53,99 +76,308 @@ def nearest_aisle(grid, start, goal):
         return None
     
     #return aisle with shortest distance to start
-    return min(candidates, key=lambda p: manhattan(p, start))
+    return min(candidates, key=lambda p: abs(p[0] - start[0]) + abs(p[1] - start[1]))
 
-def a_star_search(grid, start, goal):
+def build_shelf_aisle_map(grid):
     """
-    Performs the A* search algorithm to find the shortest path from start to goal on the given grid.
-        
-    :param grid: List of Lists representing the grid
+    Precomputes the aisle cells flanking every shelf, so searches towards a shelf only have to
+    pick the candidate closest to their start instead of inspecting the shelf's neighbours.
+    Build it once per layout and pass it to a_star_search; shelves with no accessible side map
+    to an empty tuple.
+    
+    :param grid: List of Lists representing the grid, or a packed grid
+    """
+    cells, width, height = pack_grid(grid)
+    stride = width + 2
+
+    shelf_map = {}
+    for y in range(height):
+        row = (y + 1) * stride + 1
+        for x in range(width):
+            index = row + x
+            if cells[index] != 1:
+                continue
+            #same candidates and order as nearest_aisle: left of shelf, then right
+            candidates = []
+            if cells[index - 1] == 0:
+                candidates.append((x - 1, y))
+            if cells[index + 1] == 0:
+                candidates.append((x + 1, y))
+            shelf_map[(x, y)] = tuple(candidates)
+    return shelf_map
+
+def label_components(grid):
+    """
+    Labels the connected regions of walkable cells with one flood fill over the whole grid, so
+    callers can tell in O(1) whether a goal is reachable before searching for a path.
+    Returns a flat list indexed like the packed grid: 0 for obstacles (and the border),
+    and the same positive label for every pair of cells connected by a path.
+    
+    :param grid: List of Lists representing the grid, or a packed grid
+    """
+    cells, width, height = pack_grid(grid)
+    stride = width + 2
+    offsets = (stride, 1, -stride, -1)
+
+    labels = [0] * len(cells)
+    label = 0
+    for index in range(len(cells)):
+        if cells[index] == 1 or labels[index]:
+            continue
+
+        #new region, flood it breadth first
+        label += 1
+        labels[index] = label
+        queue = deque((index,))
+        while queue:
+            current = queue.popleft()
+            for offset in offsets:
+                neighbour = current + offset
+                if cells[neighbour] != 1 and not labels[neighbour]:
+                    labels[neighbour] = label
+                    queue.append(neighbour)
+    return labels
+
+def _aisle_goal(grid, start, goal, shelf_map=None):
+    """
+    Returns the cell a search towards goal has to reach: goal itself if it is walkable, otherwise
+    (a shelf) its flanking aisle closest to start, or None if the shelf cannot be accessed at all.
+
+    :param grid: Packed grid from pack_grid
     :param start: Tuple representing the start point (x, y)
     :param goal: Tuple representing the goal point (x, y)
+    :param shelf_map: Optional table from build_shelf_aisle_map for the same grid
     """
-    start_time = time.time()
+    cells, width, height = grid
+    if cells[(goal[1] + 1) * (width + 2) + goal[0] + 1] != 1:
+        return goal
+    if shelf_map is None:
+        return nearest_aisle(grid, start, goal)
+    #precomputed flanking aisles, only the closest to start is left to pick
+    candidates = shelf_map.get(goal)
+    return min(candidates, key=lambda p: abs(p[0] - start[0]) + abs(p[1] - start[1])) if candidates else None
 
-    width = len(grid[0])
-    height = len(grid)
+def _a_star_loop(cells, stride, start, goal, came_from=None):
+    """
+    The A* loop shared by a_star_search and a_star_cost.
+    Returns (cost, expansions), cost is float("inf") when the goal cannot be reached.
 
-    #convert shelf coord to nearest aisle coord
-    if grid[goal[1]][goal[0]] == 1:    # shelf cell
-        adjusted = nearest_aisle(grid, start, goal)
-        if adjusted is None:
-            # Shelf cannot be accessed at all
-            return None, float("inf"), 0, time.time() - start_time
-        goal = adjusted   # set new aisle goal
-
-    #priority queue for open set
-    open_set = []
-    heapq.heappush(open_set, (0, 0, start))
-
-    #for reconstructing path    
-    came_from = {}
-    
-    #cost from start to this node
-    g_cost = {start: 0}
+    :param cells: Flat cell array of a packed grid
+    :param stride: Row length of the packed grid (width + 2)
+    :param start: Tuple representing the start point (x, y)
+    :param goal: Tuple representing the walkable goal point (x, y)
+    :param came_from: Optional list indexed like cells, filled with each reached cell's parent index
+    """
+    gx, gy = goal
+    record = came_from is not None
+
+    #heap functions bound to locals, the loop below runs once per expansion
+    heappush, heappop, heappushpop = heapq.heappush, heapq.heappop, heapq.heappushpop
+
+    #priority queue for open set, entries are (f, g, x, y)
+    #only the start's heuristic is computed in full, neighbours update f incrementally
+    open_set = [(abs(start[0] - gx) + abs(start[1] - gy), 0, start[0], start[1])]
+
+    #flat per-cell arrays indexed the same way as cells
+    #cost from start to this node, -1 means unvisited
+    g_cost = [-1] * len(cells)
+    g_cost[(start[1] + 1) * stride + start[0] + 1] = 0
+
+    #expanded cells, so duplicate queue entries are never expanded twice
+    closed = bytearray(len(cells))
 
     expansions = 0 #number of expanded nodes    
 
-    #4 possible movements up, right, down, left
-    directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]  
+    #4 possible movements up, right, down, left, with the matching index offset
+    directions = [(0, 1, stride), (1, 0, 1), (0, -1, -stride), (-1, 0, -1)]  
 
-    while open_set:
-        f, g, current = heapq.heappop(open_set)
+    #last entry pushed by the previous expansion, held back so it can be pushed and the next
+    #entry popped in a single heappushpop (same result as heappush followed by heappop)
+    pending = None
+
+    while open_set or pending is not None:
+        if pending is None:
+            f, g, cx, cy = heappop(open_set)
+        else:
+            f, g, cx, cy = heappushpop(open_set, pending)
+            pending = None
+        current = (cy + 1) * stride + cx + 1
+
+        #skip stale entries: a cheaper entry for the same cell has a lower f (same h),
+        #so it was popped first and closed the cell
+        if closed[current]:
+            continue
+        closed[current] = 1
         expansions += 1
         
-        #Goal reached
-        if current == goal:
-            break
+        #Goal reached, its g when it is popped is the path cost
+        if cx == gx and cy == gy:
+            return g, expansions
 
-        cx, cy = current
+        new_cost = g + 1
 
-        for dx, dy in directions:
-            nx, ny = cx + dx, cy + dy
+        #offset from this cell to the goal, for the heuristic update below
+        to_gx, to_gy = gx - cx, gy - cy
 
-            #check bounds
-            if not (0 <= nx < width and 0 <= ny < height):
-                continue
+        for dx, dy, offset in directions:
+            neighbour = current + offset
 
-            #check obstacle
-            if grid[ny][nx] == 1:
+            #check obstacle (covers the border too)
+            if cells[neighbour] == 1:
                 continue
 
-            new_cost = g_cost[current] + 1
-
             #if new node or found cheaper path, then update
-            if (nx, ny) not in g_cost or new_cost < g_cost[(nx, ny)]:
-                g_cost[(nx, ny)] = new_cost
-                f_cost = new_cost + manhattan((nx, ny), goal)
-                heapq.heappush(open_set, (f_cost, new_cost, (nx, ny)))
-                came_from[(nx, ny)] = current
-       
-    #path reconstruction
-                 
+            if g_cost[neighbour] < 0 or new_cost < g_cost[neighbour]:
+                g_cost[neighbour] = new_cost
+
+                #a step changes the Manhattan distance by exactly 1: g goes up by 1, so f stays
+                #the same when the step moves towards the goal and goes up by 2 otherwise
+                f_cost = f if to_gx * dx + to_gy * dy > 0 else f + 2
+                if pending is not None:
+                    heappush(open_set, pending)
+                pending = (f_cost, new_cost, cx + dx, cy + dy)
+                if record:
+                    came_from[neighbour] = current
+
+    # goal was never reached
+    return float("inf"), expansions
+
+def a_star_search(grid, start, goal, shelf_map=None, measure_time=False):
+    """
+    Performs the A* search algorithm to find the shortest path from start to goal on the given grid.
+        
+    :param grid: List of Lists representing the grid, or a packed grid from pack_grid
+    :param start: Tuple representing the start point (x, y)
+    :param goal: Tuple representing the goal point (x, y)
+    :param shelf_map: Optional table from build_shelf_aisle_map for the same grid
+    :param measure_time: Whether to measure the running time (False reports 0.0)
+    """
+    #the clock is only read when the caller asks for the runtime, otherwise it is reported as 0.0
+    start_time = time.time() if measure_time else 0.0
+
+    #flat byte grid with an obstacle border, see pack_grid
+    grid = pack_grid(grid)
+    cells, width, height = grid
+    stride = width + 2
+
+    #convert shelf coord to nearest aisle coord
+    goal = _aisle_goal(grid, start, goal, shelf_map)
+    if goal is None:
+        # Shelf cannot be accessed at all
+        return None, float("inf"), 0, (time.time() - start_time if measure_time else 0.0)
+
+    #parent of every reached cell, for reconstructing path
+    came_from = [-1] * len(cells)
+    cost, expansions = _a_star_loop(cells, stride, start, goal, came_from)
+
     # If goal was never reached
-    if goal not in came_from and start != goal:
-        runtime = time.time() - start_time
-        return None, float("inf"), expansions, runtime
+    if cost == float("inf"):
+        return None, cost, expansions, (time.time() - start_time if measure_time else 0.0)
 
-    # Reconstruct path
+    # Reconstruct path (just the start when start == goal)
     path = []
-    node = goal
+    node = (goal[1] + 1) * stride + goal[0] + 1
+    start_index = (start[1] + 1) * stride + start[0] + 1
+
+    while node != start_index:
+        path.append((node % stride - 1, node // stride - 1))
+        node = came_from[node]
+
+    path.append(start)
+    path.reverse()
+
+    runtime = time.time() - start_time if measure_time else 0.0
+
+    return path, cost, expansions, runtime
+
+def a_star_cost(grid, start, goal, shelf_map=None):
+    """
+    Performs the same search as a_star_search but only returns the cost, for callers that never
+    use the path: no parent array is kept and no path is rebuilt.
+    Returns (cost, expansions), cost is float("inf") when the goal cannot be reached.
+
+    :param grid: List of Lists representing the grid, or a packed grid from pack_grid
+    :param start: Tuple representing the start point (x, y)
+    :param goal: Tuple representing the goal point (x, y)
+    :param shelf_map: Optional table from build_shelf_aisle_map for the same grid
+    """
+    grid = pack_grid(grid)
+    goal = _aisle_goal(grid, start, goal, shelf_map)
+    if goal is None:
+        return float("inf"), 0
+    return _a_star_loop(grid[0], grid[1] + 2, start, goal)
+
+def bfs_search(grid, start, goal, shelf_map=None, measure_time=False):
+    """
+    Performs breadth-first search from start to goal. Every step costs 1, so the first time the
+    goal is reached is along a shortest path, with the same cost as a_star_search but without a
+    priority queue. Returns the same (path, cost, expansions, runtime) tuple as a_star_search.
+
+    :param grid: List of Lists representing the grid, or a packed grid from pack_grid
+    :param start: Tuple representing the start point (x, y)
+    :param goal: Tuple representing the goal point (x, y)
+    :param shelf_map: Optional table from build_shelf_aisle_map for the same grid
+    :param measure_time: Whether to measure the running time (False reports 0.0)
+    """
+    start_time = time.time() if measure_time else 0.0
+
+    #flat byte grid with an obstacle border, see pack_grid
+    grid = pack_grid(grid)
+    cells, width, height = grid
+    stride = width + 2
+
+    #convert shelf coord to nearest aisle coord
+    goal = _aisle_goal(grid, start, goal, shelf_map)
+    if goal is None:
+        return None, float("inf"), 0, (time.time() - start_time if measure_time else 0.0)
 
-    # Special case: start == goal
     if start == goal:
-        return [start], 0, expansions, time.time() - start_time
+        return [start], 0, 1, (time.time() - start_time if measure_time else 0.0)
 
-    while node != start:
-        path.append(node)
-        node = came_from[node]
+    start_index = (start[1] + 1) * stride + start[0] + 1
+    goal_index = (goal[1] + 1) * stride + goal[0] + 1
+
+    #parent cell index, -1 means not reached yet
+    came_from = [-1] * len(cells)
+    came_from[start_index] = start_index
+
+    #cells are queued once, in order of distance from start
+    queue = deque((start_index,))
+    popleft, append = queue.popleft, queue.append
+    offsets = (stride, 1, -stride, -1)
+    expansions = 0
 
+    while queue:
+        current = popleft()
+        expansions += 1
+
+        for offset in offsets:
+            neighbour = current + offset
+            #walls (and the border) and cells already queued are skipped
+            if cells[neighbour] == 1 or came_from[neighbour] >= 0:
+                continue
+            came_from[neighbour] = current
+            append(neighbour)
+
+        if came_from[goal_index] >= 0:
+            break
+
+    # If goal was never reached
+    if came_from[goal_index] < 0:
+        return None, float("inf"), expansions, (time.time() - start_time if measure_time else 0.0)
+
+    # Reconstruct path
+    path = []
+    node = goal_index
+    while node != start_index:
+        path.append((node % stride - 1, node // stride - 1))
+        node = came_from[node]
     path.append(start)
     path.reverse()
 
-    runtime = time.time() - start_time
+    runtime = time.time() - start_time if measure_time else 0.0
 
     # cost is path length minus 1
     cost = len(path) - 1
 
-    return path, cost, expansions, runtime
\ No newline at end of file
+    return path, cost, expansions, runtime
@@ -7,9 +7,6 @@ Creates aisles and shelves and export shelf coordinates into shelves.csv
 # Imports
 from db_func import db_connect
 
-# Database connection
-conn, cursor = db_connect()
-
 def create_grid(width, height):
     """
     Creates a 2D grid initialized with zeros.
@@ -18,12 +15,16 @@ def create_grid(width, height):
     :param width: Width of the grid
     :param height: Height of the grid
     """
-    return [[0 for _ in range(width)] for _ in range(height)]
+    #each row is built by list repetition in C, with its own list object per row
+    return [[0] * width for _ in range(height)]
 
 def get_warehouse_grid():
     """
     Retrieves shelf and path coordinates from the database.
+    The shared connection is opened here on first use rather than on import,
+    so importing the grid helpers alone never touches the database.
     """
+    conn, cursor = db_connect()
     shelves=[]
     paths=[]
     cursor.execute("SELECT xPos, yPos FROM spaces WHERE type='shelf';")
@@ -33,16 +34,6 @@ def get_warehouse_grid():
     
     return shelves, paths
 
-def add_obstacle(grid, x, y):
-    """
-    Adds an obstacle at the specified (x, y) position in the grid.
-    
-    :param grid: List of Lists representing the grid
-    :param x: X-coordinate of the obstacle
-    :param y: Y-coordinate of the obstacle
-    """
-    grid[y][x]= 1
-
 def generate_warehouse(width, height, shelf_coords):
     """
     Generates a warehouse grid with shelves as obstacles.
@@ -53,8 +44,9 @@ def generate_warehouse(width, height, shelf_coords):
     """
     grid = create_grid(width, height)
     
+    #mark every shelf cell as an obstacle
     for x, y in shelf_coords:
-        add_obstacle(grid, x, y)
+        grid[y][x] = 1
     
     return grid
 
@@ -64,13 +56,11 @@ def print_grid(grid):
     
     :param grid: List of Lists representing the grid
     """
-    for row in grid:
-        print(" ".join(str(cell) for cell in row))
+    print("\n".join(" ".join(map(str, row)) for row in grid))
 
 # test code
-'''
-shelf_coords, path_coords = get_warehouse_grid()
-grid=generate_warehouse(63, 13, shelf_coords)
+if __name__ == "__main__":
+    shelf_coords, path_coords = get_warehouse_grid()
+    grid = generate_warehouse(63, 13, shelf_coords)
 
-print_grid(grid)
-'''
\ No newline at end of file
+    print_grid(grid)
@@ -9,87 +9,93 @@ import os
 import json
 import random
 import numpy as np
-import heapq
 import time
 
+from dataclasses import dataclass
 from typing import List, Tuple, Optional
-from dqn_model import DQNAgent, GridEnvironment
+from dqn_model import DQNAgent, GridEnvironment, VectorGridEnvironment
 from setGrid import generate_warehouse, get_warehouse_grid
+from search import a_star_cost, a_star_search as grid_a_star_search, label_components, pack_grid
 
 #==================== A* PATHFINDING ====================
 
-def heuristic(pos: Tuple[int, int], goal: Tuple[int, int]) -> float:
-    """Manhattan distance heuristic"""
-    return abs(pos[0] - goal[0]) + abs(pos[1] - goal[1])
-
-def get_neighbors(grid: List[List[int]], pos: Tuple[int, int]) -> List[Tuple[int, int]]:
-    """Get valid neighboring positions (up, down, left, right)"""
-    row, col = pos
-    height = len(grid)
-    width = len(grid[0])
-    neighbors = []
-    
-    for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-        new_row, new_col = row + dr, col + dc
-        if 0 <= new_row < height and 0 <= new_col < width:
-            if grid[new_row][new_col] != 1:  #Not a wall
-                neighbors.append((new_row, new_col))
-    
-    return neighbors
-
 def a_star_search(
-    grid: List[List[int]],
+    grid,
     start: Tuple[int, int],
-    goal: Tuple[int, int]
+    goal: Tuple[int, int],
+    components: Optional[List[int]] = None,
+    need_path: bool = True
 ) -> Tuple[Optional[List[Tuple[int, int]]], int, int]:
-    """Find shortest path using A* algorithm"""
-    open_set = [(0, 0, start)]
-    counter = 0
-    came_from = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
-    closed_set = set()
-    expansions = 0
-    
-    while open_set:
-        _, _, current = heapq.heappop(open_set)
-        
-        if current in closed_set:
-            continue
-        
-        closed_set.add(current)
-        expansions += 1
-        
-        if current == goal:
-            path = []
-            node = current
-            while node in came_from:
-                path.append(node)
-                node = came_from[node]
-            path.append(start)
-            path.reverse()
-            return path, len(path) - 1, expansions
-        
-        for neighbor in get_neighbors(grid, current):
-            if neighbor in closed_set:
-                continue
-            
-            tentative_g = g_score[current] + 1
-            
-            if neighbor in g_score and tentative_g >= g_score[neighbor]:
-                continue
-            
-            came_from[neighbor] = current
-            g_score[neighbor] = tentative_g
-            new_f = tentative_g + heuristic(neighbor, goal)
-            f_score[neighbor] = new_f
-            counter += 1
-            heapq.heappush(open_set, (new_f, counter, neighbor))
-    
-    return None, -1, expansions
+    """
+    Find shortest path using A* on (row, col) positions
+    
+    The search itself is search.a_star_search, which works on (x, y) positions.
+    Unlike that one, a goal that is a wall or off the grid is unreachable here
+    instead of being moved to the aisle beside it.
+    
+    Args:
+        grid: 2D grid (0=walkable, 1=wall), or a packed grid from pack_grid
+        start: Starting position (row, col)
+        goal: Goal position (row, col)
+        components: Optional labels from search.label_components for the same grid,
+                    a goal in another region is then rejected without searching
+        need_path: False runs search.a_star_cost, which skips building the path
+    
+    Returns:
+        Tuple of (path, cost, expansions), path is a list of (row, col) or None
+        (always None when need_path is False, cost is -1 if there is no path)
+    """
+    cells, width, height = grid = pack_grid(grid)
+    (start_row, start_col), (goal_row, goal_col) = start, goal
+    
+    #Positions off the grid have no cell in the packed grid
+    if not (0 <= start_row < height and 0 <= start_col < width):
+        return None, -1, 0
+    
+    #Already there, even on a wall (search.a_star_search would move a wall goal to an aisle)
+    if start == goal:
+        return [start], 0, 1
+    if not (0 <= goal_row < height and 0 <= goal_col < width
+            and cells[(goal_row + 1) * (width + 2) + goal_col + 1] != 1):
+        return None, -1, 0
+    
+    #Start and goal in different regions: no path, skip the search that would flood the start's region
+    #(a start on a wall has label 0 and is left to the search, which can still step off it)
+    if components is not None:
+        start_label = components[(start_row + 1) * (width + 2) + start_col + 1]
+        if start_label and start_label != components[(goal_row + 1) * (width + 2) + goal_col + 1]:
+            return None, -1, 0
+    
+    if not need_path:
+        cost, expansions = a_star_cost(grid, (start_col, start_row), (goal_col, goal_row))
+        return None, (cost if cost != float("inf") else -1), expansions
+    
+    path, cost, expansions, _ = grid_a_star_search(grid, (start_col, start_row), (goal_col, goal_row))
+    if path is None:
+        return None, -1, expansions
+    return [(y, x) for x, y in path], cost, expansions
 
 #==================== TRAINING DATA GENERATION ====================
 
+@dataclass
+class AStarSamples:
+    """
+    A* training samples as parallel arrays, sample i is row i of each array
+    
+    Attributes:
+        starts: Start positions, int32 [N, 2]
+        goals: Goal positions, int32 [N, 2]
+        path_lengths: A* path length, -1 if no path, int32 [N]
+        path_exists: Whether A* found a path, bool [N]
+    """
+    starts: np.ndarray
+    goals: np.ndarray
+    path_lengths: np.ndarray
+    path_exists: np.ndarray
+    
+    def __len__(self):
+        return len(self.path_exists)
+
 def generate_training_samples(grid, aisles, shelves, num_samples=1000):
     """
     Generate training samples on-the-fly using A* search.
@@ -101,38 +107,55 @@ def generate_training_samples(grid, aisles, shelves, num_samples=1000):
         num_samples: Number of samples to generate
     
     Returns:
-        List of dicts with 'start', 'goal', 'path_length', 'path_exists'
+        AStarSamples holding the start, goal, path length and path existence of each sample
     """
-    samples = []
+    #One preallocated array per field instead of a dict per sample
+    samples = AStarSamples(
+        starts=np.empty((num_samples, 2), dtype=np.int32),
+        goals=np.empty((num_samples, 2), dtype=np.int32),
+        path_lengths=np.empty(num_samples, dtype=np.int32),
+        path_exists=np.empty(num_samples, dtype=bool)
+    )
     print(f"Generating {num_samples} A* training samples...")
     
+    #Pack the grid and label its connected regions once instead of once per search
+    packed_grid = pack_grid(grid)
+    components = label_components(packed_grid)
+    
     for i in range(num_samples):
         if (i + 1) % 50 == 0:
             print(f"  Progress: {i + 1}/{num_samples}")
         
         start = random.choice(aisles)
         goal = random.choice(shelves)
-        path, cost, expansions = a_star_search(grid, start, goal)
-        
-        #Create sample dict
-        sample = {
-            'start': start,
-            'goal': goal,
-            'path_length': cost if path is not None else -1,
-            'path_exists': 1 if path is not None else 0
-        }
+        #Only the path length is kept, so the path itself is never built
+        path, cost, expansions = a_star_search(packed_grid, start, goal, components, need_path=False)
         
-        samples.append(sample)
+        #Store the sample in row i (cost is -1 when there is no path)
+        samples.starts[i] = start
+        samples.goals[i] = goal
+        samples.path_lengths[i] = cost
+        samples.path_exists[i] = cost >= 0
     
     print(f"Generated {num_samples} training samples!")
     return samples
 
 #==================== SAVE FUNCTIONS ====================
 
+def _to_cpu(obj):
+    """Copy every tensor in a (nested) state dict to the CPU, so saved files load on any device"""
+    if isinstance(obj, torch.Tensor):
+        return obj.detach().cpu()
+    if isinstance(obj, dict):
+        return {key: _to_cpu(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_to_cpu(value) for value in obj)
+    return obj
+
 def save_agent(agent, filepath):
     """Save trained network weights"""
     os.makedirs(os.path.dirname(filepath) if os.path.dirname(filepath) else '.', exist_ok=True)
-    torch.save(agent.network.state_dict(), filepath)
+    torch.save(_to_cpu(agent.network.state_dict()), filepath)
     print(f"Agent saved to {filepath}")
 
 def save_checkpoint(agent, episode, filepath):
@@ -140,9 +163,9 @@ def save_checkpoint(agent, episode, filepath):
     os.makedirs(os.path.dirname(filepath) if os.path.dirname(filepath) else '.', exist_ok=True)
     checkpoint = {
         'episode': episode,
-        'model_state_dict': agent.network.state_dict(),
-        'target_network_state_dict': agent.target_network.state_dict(),
-        'optimizer_state_dict': agent.optimizer.state_dict(),
+        'model_state_dict': _to_cpu(agent.network.state_dict()),
+        'target_network_state_dict': _to_cpu(agent.target_network.state_dict()),
+        'optimizer_state_dict': _to_cpu(agent.optimizer.state_dict()),
         'epsilon': agent.epsilon,
     }
     torch.save(checkpoint, filepath)
@@ -151,7 +174,7 @@ def save_checkpoint(agent, episode, filepath):
 #==================== TRAINING WITH A* GUIDANCE ====================
 
 def train_agent(grid, start, target_item, a_star_samples=None,
-                episodes=1000, batch_size=32):
+                episodes=1000, batch_size=32, train_every=1, use_compile=False):
     """
     Train DQN agent with optional A* data guidance.
     
@@ -159,25 +182,34 @@ def train_agent(grid, start, target_item, a_star_samples=None,
         grid: 2D grid (0=walkable, 1=wall, other=shelf)
         start: Starting position
         target_item: Target item number
-        a_star_samples: Pre-generated A* samples (or None to skip)
+        a_star_samples: Pre-generated AStarSamples (or None to skip)
         episodes: Number of training episodes
         batch_size: Replay buffer batch size
+        train_every: Environment steps per replay update (1 trains on every step)
+        use_compile: Compile the training step with torch.compile (see DQNAgent)
     
     Returns:
         Tuple of (agent, env, stats)
     """
-    #Create environment
-    env = GridEnvironment(grid, start, target_item)
-    
     #Create agent
     state_size = 12
     action_size = 4
-    agent = DQNAgent(state_size, action_size)
+    agent = DQNAgent(state_size, action_size, use_compile=use_compile)
+    
+    #Create environment, building states on the agent's device
+    env = GridEnvironment(grid, start, target_item, device=agent.device)
     
     #Training statistics
     episode_rewards = []
     episode_steps = []
-    use_a_star = a_star_samples is not None and len(a_star_samples) > 0
+    #Indices of the samples whose path exists, the only ones used for guidance
+    feasible = (np.flatnonzero(a_star_samples.path_exists) if a_star_samples is not None
+                else np.empty(0, dtype=np.int64))
+    use_a_star = len(feasible) > 0
+    
+    #Running totals of the episodes since the last progress line, for its averages
+    window_reward = 0.0
+    window_steps = 0
     
     print(f"Starting training for {episodes} episodes...")
     print(f"A* guidance: {'Enabled' if use_a_star else 'Disabled'}")
@@ -186,21 +218,16 @@ def train_agent(grid, start, target_item, a_star_samples=None,
     #Main training loop
     for episode in range(episodes):
         #Decide whether to use A* sample (30% chance)
-        use_a_star_sample = (use_a_star and 
-                            a_star_samples and 
-                            random.random() < 0.3)
+        use_a_star_sample = use_a_star and random.random() < 0.3
         
-        #Update environment with A* sample if chosen
+        #Update environment with A* sample if chosen, drawn from the samples whose path exists
         if use_a_star_sample:
-            a_star_sample = random.choice(a_star_samples)
+            sample_index = feasible[random.randrange(len(feasible))]
+            episode_start = tuple(a_star_samples.starts[sample_index].tolist())
+            episode_goal_pos = tuple(a_star_samples.goals[sample_index].tolist())
             
-            #Only use if path exists
-            if a_star_sample['path_exists']:
-                episode_start = a_star_sample['start']
-                episode_goal_pos = a_star_sample['goal']
-                
-                #Use the proper method to safely update environment
-                env.set_episode_target(episode_start, episode_goal_pos)
+            #Use the proper method to safely update environment
+            env.set_episode_target(episode_start, episode_goal_pos)
         
         #Reset environment for new episode
         state = env.reset()
@@ -224,12 +251,15 @@ def train_agent(grid, start, target_item, a_star_samples=None,
             state = next_state
             steps += 1
             
-            #Train on batch from memory
-            agent.replay(batch_size)
+            #Train on batch from memory every train_every steps, once it holds enough experiences for a batch
+            if steps % train_every == 0 and agent.size >= batch_size:
+                agent.replay(batch_size)
         
         #Store statistics for this episode
         episode_rewards.append(total_reward)
         episode_steps.append(steps)
+        window_reward += total_reward
+        window_steps += steps
         
         #Update target network periodically
         if (episode + 1) % 10 == 0:
@@ -240,8 +270,10 @@ def train_agent(grid, start, target_item, a_star_samples=None,
         
         #Print progress
         if (episode + 1) % 50 == 0:
-            avg_reward = np.mean(episode_rewards[-50:])
-            avg_steps = np.mean(episode_steps[-50:])
+            avg_reward = window_reward / 50
+            avg_steps = window_steps / 50
+            window_reward = 0.0
+            window_steps = 0
             print(f"Episode {episode + 1}/{episodes} | Avg Reward: {avg_reward:7.2f} | "
                   f"Avg Steps: {avg_steps:6.1f} | Epsilon: {agent.epsilon:.4f}")
     
@@ -257,15 +289,147 @@ def train_agent(grid, start, target_item, a_star_samples=None,
     
     return agent, env, stats
 
+def train_agent_vectorized(grid, start, target_item, a_star_samples=None,
+                           episodes=1000, batch_size=32, train_every=1, num_envs=8,
+                           use_compile=False):
+    """
+    Train DQN agent on several environments stepped together.
+    
+    The environments live in one VectorGridEnvironment, so each step is one
+    batched forward for all of their actions and one write of all their
+    transitions into the replay buffer. Episodes are counted, and A* samples,
+    target updates and epsilon decay applied, per finished episode as in train_agent.
+    
+    Args:
+        grid: 2D grid (0=walkable, 1=wall, other=shelf)
+        start: Starting position
+        target_item: Target item number
+        a_star_samples: Pre-generated AStarSamples (or None to skip)
+        episodes: Number of training episodes, summed over all environments
+        batch_size: Replay buffer batch size
+        train_every: Vector steps per replay update
+        num_envs: Number of environments stepped together
+        use_compile: Compile the training step with torch.compile (see DQNAgent)
+    
+    Returns:
+        Tuple of (agent, env, stats), env is the VectorGridEnvironment
+    """
+    #Create agent
+    state_size = 12
+    action_size = 4
+    agent = DQNAgent(state_size, action_size, use_compile=use_compile)
+    
+    #Goal lookup for the target item as in train_agent, every environment starts on it
+    goal_pos = GridEnvironment(grid, start, target_item).goal_pos
+    env = VectorGridEnvironment(grid, [start] * num_envs, [goal_pos] * num_envs)
+    
+    #Training statistics, plus the running reward and step count of each environment
+    episode_rewards = []
+    episode_steps = []
+    running_rewards = np.zeros(num_envs)
+    running_steps = np.zeros(num_envs, dtype=np.int64)
+    #Indices of the samples whose path exists, the only ones used for guidance
+    feasible = (np.flatnonzero(a_star_samples.path_exists) if a_star_samples is not None
+                else np.empty(0, dtype=np.int64))
+    use_a_star = len(feasible) > 0
+    
+    #Running totals of the episodes since the last progress line, for its averages
+    window_reward = 0.0
+    window_steps = 0
+    
+    print(f"Starting training for {episodes} episodes on {num_envs} environments...")
+    print(f"A* guidance: {'Enabled' if use_a_star else 'Disabled'}")
+    print("=" * 60)
+    
+    states = env.reset()
+    vector_steps = 0
+    
+    #Main training loop, runs until enough episodes have finished across all environments
+    while len(episode_rewards) < episodes:
+        #One forward chooses the actions of all environments
+        actions = agent.act_batch(states)
+        next_states, rewards, dones = env.step(actions)
+        
+        #Store every environment's experience in one batched write
+        agent.remember_batch(states, actions, rewards, next_states, dones)
+        
+        running_rewards += rewards
+        running_steps += 1
+        vector_steps += 1
+        
+        #Train on batch from memory every train_every steps, once it holds enough experiences for a batch
+        if vector_steps % train_every == 0 and agent.size >= batch_size:
+            agent.replay(batch_size)
+        
+        if not dones.any():
+            states = next_states
+            continue
+        
+        #Per finished episode bookkeeping, same as the end of an episode in train_agent
+        for i in np.flatnonzero(dones):
+            if len(episode_rewards) == episodes:
+                break
+            episode_rewards.append(float(running_rewards[i]))
+            episode_steps.append(int(running_steps[i]))
+            window_reward += episode_rewards[-1]
+            window_steps += episode_steps[-1]
+            running_rewards[i] = 0.0
+            running_steps[i] = 0
+            episode = len(episode_rewards) - 1
+            
+            #Update target network periodically
+            if (episode + 1) % 10 == 0:
+                agent.update_target_network()
+            
+            #Decay exploration rate
+            agent.decay_epsilon()
+            
+            #Print progress
+            if (episode + 1) % 50 == 0:
+                avg_reward = window_reward / 50
+                avg_steps = window_steps / 50
+                window_reward = 0.0
+                window_steps = 0
+                print(f"Episode {episode + 1}/{episodes} | Avg Reward: {avg_reward:7.2f} | "
+                      f"Avg Steps: {avg_steps:6.1f} | Epsilon: {agent.epsilon:.4f}")
+            
+            #Use an A* sample whose path exists for this environment's next episode (30% chance)
+            if use_a_star and random.random() < 0.3:
+                sample_index = feasible[random.randrange(len(feasible))]
+                env.set_episode_targets(i, a_star_samples.starts[sample_index],
+                                        a_star_samples.goals[sample_index])
+        
+        #Start new episodes in the environments that finished
+        states = env.reset(dones)
+    
+    print("=" * 60)
+    print("Training complete!")
+    
+    stats = {
+        'episode_rewards': episode_rewards,
+        'episode_steps': episode_steps,
+        'final_epsilon': agent.epsilon,
+        'total_episodes': episodes
+    }
+    
+    return agent, env, stats
+
 #==================== MAIN ====================
 
 if __name__ == "__main__":
     #Configuration
     EPISODES = 1000
     BATCH_SIZE = 32
+    TRAIN_EVERY = 4  #Environment steps per replay update, the usual DQN training frequency
+    NUM_ENVS = 1  #Environments stepped together, above 1 trains with train_agent_vectorized
+    USE_COMPILE = False  #torch.compile the training step (fixed batch shape), needs a working compiler toolchain
     GENERATE_DATA = True  #Set to False to skip A* data generation
     NUM_A_STAR_SAMPLES = 1000
     
+    #One intra-op thread: the network is tiny, so splitting each matmul across cores
+    #only adds thread synchronisation (and oversubscribes cores shared with other processes)
+    torch.set_num_threads(1)
+    
     print("=" * 60)
     print("DQN PATHFINDING - TRAINING")
     print("=" * 60)
@@ -293,14 +457,29 @@ if __name__ == "__main__":
     
     #Train DQN agent
     print("--- DQN TRAINING PHASE ---")
-    agent, env, stats = train_agent(
-        grid,
-        start_pos,
-        target_item,
-        a_star_samples=a_star_samples,
-        episodes=EPISODES,
-        batch_size=BATCH_SIZE
-    )
+    if NUM_ENVS > 1:
+        agent, env, stats = train_agent_vectorized(
+            grid,
+            start_pos,
+            target_item,
+            a_star_samples=a_star_samples,
+            episodes=EPISODES,
+            batch_size=BATCH_SIZE,
+            train_every=TRAIN_EVERY,
+            num_envs=NUM_ENVS,
+            use_compile=USE_COMPILE
+        )
+    else:
+        agent, env, stats = train_agent(
+            grid,
+            start_pos,
+            target_item,
+            a_star_samples=a_star_samples,
+            episodes=EPISODES,
+            batch_size=BATCH_SIZE,
+            train_every=TRAIN_EVERY,
+            use_compile=USE_COMPILE
+        )
     
     #Save models
     os.makedirs('models', exist_ok=True)